@@ -9,13 +9,48 @@ __all__ = (
     "exceptions",
 )
 
+import importlib
+import typing as _t
+
 from loguru import logger as _logger
 
-from . import exceptions
-from .container import Container
-from .daemon import DockerDaemon
-from .files import FileSystem
-from .shell import CalledProcessError, CompletedProcess, Shell
-from .stopwatch import Stopwatch
+if _t.TYPE_CHECKING:
+    from . import exceptions
+    from .container import Container
+    from .daemon import DockerDaemon
+    from .files import FileSystem
+    from .shell import CalledProcessError, CompletedProcess, Shell
+    from .stopwatch import Stopwatch
+
+# submodules are only imported upon first access to one of their exports,
+# so that, e.g., using the Stopwatch does not require importing docker
+_LAZY_EXPORTS: dict[str, str] = {
+    "CalledProcessError": ".shell",
+    "CompletedProcess": ".shell",
+    "Container": ".container",
+    "DockerDaemon": ".daemon",
+    "FileSystem": ".files",
+    "Shell": ".shell",
+    "Stopwatch": ".stopwatch",
+    "exceptions": ".exceptions",
+}
+
+
+def __getattr__(name: str) -> object:
+    try:
+        module_name = _LAZY_EXPORTS[name]
+    except KeyError:
+        error_message = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(error_message) from None
+
+    module = importlib.import_module(module_name, __name__)
+    value = module if name == "exceptions" else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
+
 
 _logger.disable("dockerblade")
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 __all__ = ("Container",)
 
+import time
+import types
 import typing as t
 
 import attr
@@ -14,10 +16,10 @@ if t.TYPE_CHECKING:
     from types import TracebackType
     from typing import Any
 
-    from docker.models.containers import Container as DockerContainer
-
     from .daemon import DockerDaemon
 
+_EMPTY_SOURCES: tuple[str, ...] = ()
+_EMPTY_ENVIRONMENT: Mapping[str, str] = types.MappingProxyType({})
 
 
 @attr.s(slots=True, frozen=True)
@@ -35,24 +37,66 @@ class Container:
     name: str, optional
         The name, if any, assigned to the container.
     """
-    daemon: DockerDaemon = attr.ib()
-    _docker: DockerContainer = \
-        attr.ib(repr=False, eq=False, hash=False)
-    id: str = attr.ib(init=False, repr=True)
-    name: str | None = attr.ib(init=False, repr=False)
-    pid: int = attr.ib(init=False, repr=False)
+    daemon: DockerDaemon = attr.ib(eq=False)
+    id: str = attr.ib(repr=True)
+    _info_preloaded: Mapping[str, Any] | None = \
+        attr.ib(default=None, kw_only=True, repr=False, eq=False, hash=False)
+    _info_cache: tuple[float, Mapping[str, Any]] | None = \
+        attr.ib(init=False, default=None, repr=False, eq=False, hash=False)
+    _filesystem: FileSystem | None = \
+        attr.ib(init=False, default=None, repr=False, eq=False, hash=False)
+    _network_mode: str | None = \
+        attr.ib(init=False, default=None, repr=False, eq=False, hash=False)
 
     def __attrs_post_init__(self) -> None:
-        object.__setattr__(self, "id", self._docker.id)
-        object.__setattr__(self, "name", self._docker.name)
-        object.__setattr__(self, "pid", int(self._info["State"]["Pid"]))
+        # everything besides the ID is inspected lazily, on first use, unless
+        # the caller already has the results of inspecting the container
+        if self._info_preloaded is not None:
+            self._store_info(time.monotonic(), self._info_preloaded)
+
+    @property
+    def name(self) -> str | None:
+        name: str = self._info()["Name"]
+        return name.lstrip("/") or None
 
     @property
-    def _info(self) -> Mapping[str, Any]:
-        """Retrieves information about this container from Docker."""
-        info: dict[str, Any] = self.daemon.api.inspect_container(self.id)
-        assert isinstance(info, dict)
-        return info
+    def pid(self) -> int:
+        return int(self._info()["State"]["Pid"])
+
+    def _info(self, *, refresh: bool = False) -> Mapping[str, Any]:
+        """Retrieves information about this container from Docker.
+
+        Results are cached for :attr:`DockerDaemon.inspect_cache_ttl` seconds
+        so that back-to-back property reads share a single API call.
+
+        Parameters
+        ----------
+        refresh: bool
+            If :code:`True`, bypasses the cache and always asks Docker.
+        """
+        now = time.monotonic()
+        cached = self._info_cache
+        if not refresh and cached is not None:
+            fetched_at, info = cached
+            if now - fetched_at < self.daemon.inspect_cache_ttl:
+                return info
+
+        fresh: dict[str, Any] = self.daemon.api.inspect_container(self.id)
+        assert isinstance(fresh, dict)
+        self._store_info(now, fresh)
+        return fresh
+
+    def _store_info(self, fetched_at: float, info: Mapping[str, Any]) -> None:
+        object.__setattr__(self, "_info_cache", (fetched_at, info))
+        # the network mode of a container can't be changed after creation,
+        # so it is kept for the lifetime of this object rather than expired
+        if self._network_mode is None:
+            mode = info["HostConfig"]["NetworkMode"]
+            object.__setattr__(self, "_network_mode", mode)
+
+    def invalidate(self) -> None:
+        """Discards any cached information about this container."""
+        object.__setattr__(self, "_info_cache", None)
 
     def _exec_id_to_host_pid(self, exec_id: str) -> int:
         """Returns the host PID for a given exec command in this container."""
@@ -68,9 +112,9 @@ class Container:
               ) -> Shell:
         """Constructs a shell for this Docker container."""
         if not environment:
-            environment = {}
+            environment = _EMPTY_ENVIRONMENT
         if not sources:
-            sources = ()
+            sources = _EMPTY_SOURCES
         return Shell(
             self,
             path,
@@ -79,12 +123,22 @@ class Container:
         )
 
     def filesystem(self) -> FileSystem:
-        """Provides access to the filesystem for this container."""
-        return FileSystem(self, self.shell())
+        """Provides access to the filesystem for this container.
+
+        The filesystem, and the shell that backs it, are created upon first
+        use and shared by subsequent calls until the container is removed.
+        """
+        filesystem = self._filesystem
+        if filesystem is None:
+            filesystem = FileSystem(self, self.shell())
+            object.__setattr__(self, "_filesystem", filesystem)
+        return filesystem
 
     def remove(self, *, force: bool = True) -> None:
         """Removes this Docker container."""
-        self._docker.remove(force=force)
+        self.daemon.api.remove_container(self.id, force=force)
+        object.__setattr__(self, "_filesystem", None)
+        self.invalidate()
 
     def persist(
         self,
@@ -105,8 +159,9 @@ class Container:
         str
             The ID of the generated image.
         """
-        id_: str = self._docker.commit(repository, tag).id
+        id_: str = self.daemon.api.commit(self.id, repository, tag)["Id"]
         assert isinstance(id_, str)
+        self.invalidate()
         return id_
 
     @property
@@ -116,16 +171,18 @@ class Container:
         If the container uses the host network mode, 127.0.0.1 (i.e., localhost)
         will be assigned as the ip_address of this container.
         """
-        info = self._info
-        if info["HostConfig"]["NetworkMode"] == "host":
+        if self.network_mode == "host":
             return "127.0.0.1"
+        info = self._info()
         ip_address: str | None = info["NetworkSettings"].get("IPAddress", None)
         return ip_address
 
     @property
     def network_mode(self) -> str:
         """The network mode used by this container."""
-        mode: str = self._info["HostConfig"]["NetworkMode"]
+        mode = self._network_mode
+        if mode is None:
+            mode = self._info()["HostConfig"]["NetworkMode"]
         assert isinstance(mode, str)
         return mode
 
@@ -2,35 +2,116 @@ from __future__ import annotations
 
 __all__ = ("DockerDaemon",)
 
+import threading
 import typing as t
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
 import attr
 import docker
+from docker.constants import DEFAULT_TIMEOUT_SECONDS
 from loguru import logger
 
 from dockerblade.container import Container
 
 if t.TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Iterable, Mapping, Sequence
     from types import TracebackType
 
+    from docker.types.daemon import CancellableStream
 
 
-@attr.s(frozen=True)
+
+@attr.s(frozen=True, slots=True)
 class DockerDaemon:
-    """Maintains a connection to a Docker daemon."""
+    """Maintains a connection to a Docker daemon.
+
+    Attributes
+    ----------
+    url: str, optional
+        The URL of the Docker daemon. If unspecified, the connection settings
+        are taken from the environment.
+    inspect_cache_ttl: float
+        The number of seconds for which the results of inspecting a container
+        may be reused before Docker is asked again.
+    max_pool_size: int
+        The maximum number of connections to the daemon that may be kept open
+        at once. Should be at least as large as the number of workers used by
+        :meth:`provision_many` to avoid serializing concurrent requests.
+    timeout: int
+        The number of seconds to wait for a response from the daemon before
+        giving up on an API call.
+    watch_events: bool
+        If :code:`True`, container events are streamed from the daemon in the
+        background and used to discard stale inspect results as soon as a
+        container changes. This makes it safe to use a long
+        :code:`inspect_cache_ttl`.
+    """
     url: str | None = attr.ib(default=None)
+    inspect_cache_ttl: float = attr.ib(default=1.0)
+    max_pool_size: int = attr.ib(default=32)
+    timeout: int = attr.ib(default=DEFAULT_TIMEOUT_SECONDS)
+    watch_events: bool = attr.ib(default=False)
     client: docker.DockerClient = \
         attr.ib(init=False, eq=False, hash=False, repr=False)
     api: docker.APIClient = \
         attr.ib(init=False, eq=False, hash=False, repr=False)
+    _containers: weakref.WeakValueDictionary[str, Container] = \
+        attr.ib(init=False, factory=weakref.WeakValueDictionary,
+                eq=False, hash=False, repr=False)
+    _events: CancellableStream[dict[str, t.Any]] | None = \
+        attr.ib(init=False, default=None, eq=False, hash=False, repr=False)
+
+    # connections that are shared across the process, keyed by URL, together
+    # with the number of outstanding references to each of them
+    _shared: t.ClassVar[dict[str | None, tuple[DockerDaemon, int]]] = {}
+    _shared_lock: t.ClassVar[threading.Lock] = threading.Lock()
 
     def __attrs_post_init__(self) -> None:
-        client = docker.DockerClient(self.url)
+        # the low-level API client shares the connection pool of the high-level
+        # client rather than opening a second connection to the daemon.
+        # pooled connections are kept alive between requests by the session.
+        client = docker.DockerClient(
+            base_url=self.url,
+            max_pool_size=self.max_pool_size,
+            timeout=self.timeout,
+        )
         api = client.api
         object.__setattr__(self, "client", client)
         object.__setattr__(self, "api", api)
-        logger.debug(f"created daemon connection: {self}")
+        if self.watch_events:
+            self._start_event_pump()
+        logger.debug("created daemon connection: {}", self)
+
+    @classmethod
+    def shared(cls, url: str | None = None) -> DockerDaemon:
+        """Returns a process-wide connection to a given Docker daemon.
+
+        Each call to this method must be balanced by a call to :meth:`close`
+        (e.g., by using the returned daemon as a context manager). The
+        underlying connection is only closed once its last user has closed it.
+
+        Parameters
+        ----------
+        url: str, optional
+            The URL of the Docker daemon. If unspecified, the connection
+            settings are taken from the environment.
+        """
+        with cls._shared_lock:
+            daemon, refcount = cls._shared.get(url, (None, 0))
+            if daemon is None:
+                daemon = cls(url=url)
+            cls._shared[url] = (daemon, refcount + 1)
+        return daemon
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Closes all shared daemon connections, regardless of their users."""
+        with cls._shared_lock:
+            daemons = [daemon for daemon, _ in cls._shared.values()]
+            cls._shared.clear()
+        for daemon in daemons:
+            daemon._disconnect()
 
     def __enter__(self) -> t.Self:
         return self
@@ -42,20 +123,134 @@ class DockerDaemon:
                  ) -> None:
         self.close()
 
+    def _start_event_pump(self) -> None:
+        """Invalidates cached container information as events arrive."""
+        events = self.api.events(decode=True, filters={"type": "container"})
+        object.__setattr__(self, "_events", events)
+        thread = threading.Thread(
+            target=self._pump_events,
+            args=(events,),
+            name="dockerblade-events",
+            daemon=True,
+        )
+        thread.start()
+
+    def _pump_events(self, events: CancellableStream[dict[str, t.Any]]) -> None:
+        try:
+            for event in events:
+                id_ = event.get("Actor", {}).get("ID") or event.get("id")
+                container = self._containers.get(id_) if id_ else None
+                if container is not None:
+                    container.invalidate()
+        except Exception:  # noqa: BLE001
+            # the stream is torn down from underneath us upon closing
+            logger.debug("stopped streaming events from daemon")
+
     def close(self) -> None:
-        logger.debug(f"closing daemon connection: {self}")
+        with self._shared_lock:
+            daemon, refcount = self._shared.get(self.url, (None, 0))
+            if daemon is self:
+                if refcount > 1:
+                    self._shared[self.url] = (self, refcount - 1)
+                    return
+                del self._shared[self.url]
+        self._disconnect()
+
+    def _disconnect(self) -> None:
+        logger.debug("closing daemon connection: {}", self)
+        if self._events is not None:
+            self._events.close()
         self.api.close()
         self.client.close()
-        logger.debug(f"closed daemon connection: {self}")
+        logger.debug("closed daemon connection: {}", self)
 
     def attach(self, id_or_name: str) -> Container:
         """Attaches to a running Docker with a given ID or name."""
-        logger.debug(f"attaching to container with ID or name [{id_or_name}]")
-        docker_container = self.client.containers.get(id_or_name)
-        container = Container(daemon=self, docker=docker_container)
-        logger.debug(f"attached to container [{container}]")
+        logger.debug("attaching to container with ID or name [{}]", id_or_name)
+        info = self.api.inspect_container(id_or_name)
+        container = Container(daemon=self, id=info["Id"], info_preloaded=info)
+        self._containers[container.id] = container
+        logger.debug("attached to container [{}]", container)
         return container
 
+    def inspect_many(
+        self,
+        ids: Sequence[str],
+        *,
+        max_workers: int = 8,
+    ) -> list[dict[str, t.Any]]:
+        """Concurrently inspects several Docker containers.
+
+        Requests are spread across the connection pool of the underlying
+        client, so :attr:`max_pool_size` should be at least as large as
+        :code:`max_workers`.
+
+        Returns
+        -------
+        list[dict[str, t.Any]]
+            The inspection results for each container, in the given order.
+
+        Raises
+        ------
+        docker.errors.NotFound
+            If no container exists for one of the given IDs.
+        """
+        if not ids:
+            return []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.api.inspect_container, ids))
+
+    def attach_many(
+        self,
+        ids: Sequence[str],
+        *,
+        preload: bool = False,
+    ) -> list[Container]:
+        """Attaches to several Docker containers with the given IDs.
+
+        Rather than inspecting each container in turn, all of the containers
+        are looked up via a single API call. Details that are only available
+        by inspecting a container (e.g., its PID) are fetched lazily, unless
+        :code:`preload` is set, in which case the containers are inspected
+        concurrently up front via :meth:`inspect_many`.
+
+        Raises
+        ------
+        docker.errors.NotFound
+            If no container exists for one of the given IDs.
+        """
+        logger.debug("attaching to containers with IDs {}", ids)
+        if not ids:
+            return []
+
+        containers: list[Container] = []
+        if preload:
+            for info in self.inspect_many(ids, max_workers=self.max_pool_size):
+                container = Container(
+                    daemon=self,
+                    id=info["Id"],
+                    info_preloaded=info,
+                )
+                self._containers[container.id] = container
+                containers.append(container)
+            logger.debug("attached to containers {}", containers)
+            return containers
+
+        full_ids: list[str] = [
+            entry["Id"]
+            for entry in self.api.containers(all=True, filters={"id": list(ids)})
+        ]
+        for id_ in ids:
+            full_id = next((f for f in full_ids if f.startswith(id_)), None)
+            if full_id is None:
+                error_message = f"No such container: {id_}"
+                raise docker.errors.NotFound(error_message)
+            container = Container(daemon=self, id=full_id)
+            self._containers[container.id] = container
+            containers.append(container)
+        logger.debug("attached to containers {}", containers)
+        return containers
+
     def provision(
         self,
         image: str,
@@ -112,20 +307,82 @@ class DockerDaemon:
         Container
             An interface to the newly launched container.
         """
-        logger.debug(f"provisioning container for image [{image}]")
-        docker_container = \
-            self.client.containers.run(image,
-                                       command=command,
-                                       stdin_open=True,
-                                       detach=True,
-                                       name=name,
-                                       entrypoint=entrypoint,
-                                       environment=environment,
-                                       ports=ports,
-                                       user=user,
-                                       volumes=volumes,
-                                       network_mode=network_mode)
-        container = self.attach(docker_container.id)
-        logger.debug(f"provisioned container [{container}]"
-                     f" for image [{image}]")
+        logger.debug("provisioning container for image [{}]", image)
+        binds: dict[str, t.Any] | None = dict(volumes) if volumes else None
+        port_bindings: dict[int | str, t.Any] | None = \
+            dict(ports.items()) if ports else None
+        host_config = self.api.create_host_config(
+            binds=binds,
+            network_mode=network_mode,
+            port_bindings=port_bindings,
+        )
+
+        def create() -> str:
+            response = self.api.create_container(
+                image,
+                command=command,
+                stdin_open=True,
+                detach=True,
+                name=name,
+                entrypoint=entrypoint,
+                environment=dict(environment) if environment else None,
+                ports=list(ports) if ports else None,
+                user=user,
+                volumes=[v["bind"] for v in volumes.values()] if volumes else None,
+                host_config=host_config,
+            )
+            id_: str = response["Id"]
+            return id_
+
+        try:
+            container_id = create()
+        except docker.errors.ImageNotFound:
+            self.client.images.pull(image)
+            container_id = create()
+
+        self.api.start(container_id)
+        container = self.attach(container_id)
+        logger.debug("provisioned container [{}] for image [{}]",
+                     container, image)
         return container
+
+    def provision_many(
+        self,
+        specs: Sequence[Mapping[str, t.Any]],
+        *,
+        max_workers: int = 8,
+    ) -> list[Container]:
+        """Concurrently creates several Docker containers.
+
+        Each container is created and attached to by a separate worker, so the
+        wall-clock time is bounded by the concurrency of the daemon rather than
+        by the number of containers.
+
+        Parameters
+        ----------
+        specs: Sequence[Mapping[str, Any]]
+            A sequence of keyword arguments, one per container, that should be
+            passed to :meth:`provision`.
+        max_workers: int
+            The maximum number of containers that should be created at once.
+
+        Returns
+        -------
+        list[Container]
+            The newly launched containers, in the same order as :code:`specs`.
+        """
+        logger.debug("provisioning {} containers", len(specs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda spec: self.provision(**spec), specs))
+
+    def remove_many(
+        self,
+        containers: Iterable[Container],
+        *,
+        force: bool = True,
+        max_workers: int = 8,
+    ) -> None:
+        """Concurrently removes several Docker containers."""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for _ in executor.map(lambda c: c.remove(force=force), containers):
+                pass
@@ -16,104 +16,180 @@ __all__ = (
 )
 
 import subprocess as _subprocess
+import typing as t
 
 import attr as _attr
 
+# message templates for exceptions
+_UNEXPECTED_ERROR = "An unexpected error occurred: %s"
+_UNEXPECTED_ERROR_CAUSED_BY = "An unexpected error occurred: %s (%s)"
+_ENV_NOT_FOUND = "No environment variable found with name: %s"
+_COPY_FAILED = "Copy operation failed: %s"
+_IS_A_DIRECTORY = "Directory exists at path where file is expected: %s"
+_DIRECTORY_NOT_EMPTY = "Directory is not empty: %s"
+_IS_NOT_A_DIRECTORY = "Directory was expected at path: %s"
+_HOST_FILE_NOT_FOUND = "File not found [%s] on host machine"
+_CONTAINER_FILE_NOT_FOUND = "File not found [%s] in container [%s]"
+_CONTAINER_FILE_ALREADY_EXISTS = "File already exists [%s] in container [%s]"
+
 
 class DockerBladeException(Exception):
-    """Used by all exceptions that are thrown by DockerBlade."""
+    """Used by all exceptions that are thrown by DockerBlade.
 
+    Exceptions that report a missing file or variable are expected to be
+    caught as a matter of course, and suppress the display of any exception
+    that was being handled when they were raised. An explicit cause given via
+    :code:`raise ... from` is still reported.
+    """
+    __slots__: tuple[str, ...] = ()
+    _suppress_context: t.ClassVar[bool] = False
+
+    def __init_subclass__(
+        cls,
+        *,
+        suppress_context: bool | None = None,
+        **kwargs: object,
+    ) -> None:
+        # attrs rebuilds slotted classes without these keywords, so the flag
+        # is only changed when it is given explicitly
+        super().__init_subclass__(**kwargs)
+        if suppress_context is not None:
+            cls._suppress_context = suppress_context
+
+    def __new__(cls, *args: object, **kwargs: object) -> t.Self:
+        self = super().__new__(cls, *args, **kwargs)
+        if cls._suppress_context:
+            self.__suppress_context__ = True
+        return self
 
-@_attr.s(frozen=True, auto_exc=True, auto_attribs=True)
+    def __str__(self) -> str:
+        # the message is only built once it is needed, and is built afresh
+        # each time, as the fields of an exception may be changed
+        return self._format()
+
+    def _format(self) -> str:
+        """Builds the message for this exception."""
+        return super().__str__()
+
+    @classmethod
+    def _field_names(cls) -> list[str]:
+        """Returns the names of the fields of this exception, in order.
+
+        The fields of hand-written subclasses are given by their public slots.
+        """
+        fields = getattr(cls, "__attrs_attrs__", None)
+        if fields is not None:
+            return [field.name for field in fields]
+        return [name for name in cls.__slots__ if not name.startswith("_")]
+
+    def __attrs_post_init__(self) -> None:
+        # gives attrs subclasses the same args as hand-written ones: the
+        # values of their fields, in order
+        super().__init__(*(getattr(self, name) for name in self._field_names()))
+
+    def __repr__(self) -> str:
+        # used by hand-written subclasses; attrs provides its own __repr__
+        names = self._field_names()
+        if not names:
+            return super().__repr__()
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in names)
+        return f"{type(self).__name__}({fields})"
+
+
+@_attr.s(slots=True, eq=False, auto_attribs=True)
 class UnexpectedError(DockerBladeException):
     """An unexpected error occurred during an operation."""
     description: str
-    error: CalledProcessError | None = _attr.ib(default=None)
+    error: CalledProcessError | None = None
 
-    def __str__(self) -> str:
-        msg = f"An unexpected error occurred: {self.description}"
+    def _format(self) -> str:
         if self.error:
-            msg += f" ({self.error})"
-        return msg
+            return _UNEXPECTED_ERROR_CAUSED_BY % (self.description, self.error)
+        return _UNEXPECTED_ERROR % (self.description,)
 
 
-@_attr.s(frozen=True, auto_exc=True, auto_attribs=True)
-class EnvNotFoundError(DockerBladeException):
+class EnvNotFoundError(DockerBladeException, suppress_context=True):
     """No environment variable was found with the given name."""
-    name: str
+    __slots__ = ("name",)
 
-    def __str__(self) -> str:
-        return f"No environment variable found with name: {self.name}"
+    def __init__(self, name: str) -> None:
+        """Records the name of the missing variable without formatting."""
+        super().__init__(name)
+        self.name = name
+
+    def _format(self) -> str:
+        return _ENV_NOT_FOUND % (self.name,)
 
 
-@_attr.s(frozen=True, auto_exc=True, auto_attribs=True)
+@_attr.s(slots=True, eq=False, auto_attribs=True)
 class CopyFailed(DockerBladeException):
     """A copy operation failed unexpectedly."""
     reason: str
 
-    def __str__(self) -> str:
-        return f"Copy operation failed: {self.reason}"
+    def _format(self) -> str:
+        return _COPY_FAILED % (self.reason,)
 
 
-@_attr.s(frozen=True, auto_exc=True, auto_attribs=True)
+@_attr.s(slots=True, eq=False, auto_attribs=True)
 class IsADirectoryError(DockerBladeException):
     """The given path is a directory but a file was expected."""
     path: str
 
-    def __str__(self) -> str:
-        return f"Directory exists at path where file is expected: {self.path}"
+    def _format(self) -> str:
+        return _IS_A_DIRECTORY % (self.path,)
 
 
-@_attr.s(frozen=True, auto_exc=True, auto_attribs=True)
+@_attr.s(slots=True, eq=False, auto_attribs=True)
 class DirectoryNotEmpty(DockerBladeException):
     """A given directory is not empty."""
     path: str
 
-    def __str__(self) -> str:
-        return f"Directory is not empty: {self.path}"
+    def _format(self) -> str:
+        return _DIRECTORY_NOT_EMPTY % (self.path,)
 
 
-@_attr.s(frozen=True, auto_exc=True, auto_attribs=True)
+@_attr.s(slots=True, eq=False, auto_attribs=True)
 class IsNotADirectoryError(DockerBladeException):
     """The given path is not a directory."""
     path: str
 
-    def __str__(self) -> str:
-        return f"Directory was expected at path: {self.path}"
+    def _format(self) -> str:
+        return _IS_NOT_A_DIRECTORY % (self.path,)
 
 
-@_attr.s(frozen=True, auto_exc=True, auto_attribs=True)
-class HostFileNotFound(DockerBladeException):
+@_attr.s(slots=True, eq=False, auto_attribs=True)
+class HostFileNotFound(DockerBladeException, suppress_context=True):
     """No file was found at a given path on the host machine."""
     path: str
 
-    def __str__(self) -> str:
-        return f"File not found [{self.path}] on host machine"
+    def _format(self) -> str:
+        return _HOST_FILE_NOT_FOUND % (self.path,)
 
 
-@_attr.s(frozen=True, auto_exc=True, auto_attribs=True)
-class ContainerFileNotFound(DockerBladeException):
+class ContainerFileNotFound(DockerBladeException, suppress_context=True):
     """No file was found at a given path in a container."""
-    container_id: str
-    path: str
+    __slots__ = ("container_id", "path")
 
-    def __str__(self) -> str:
-        return (f"File not found [{self.path}] "
-                f"in container [{self.container_id}]")
+    def __init__(self, container_id: str, path: str) -> None:
+        """Records the container and path without formatting a message."""
+        super().__init__(container_id, path)
+        self.container_id = container_id
+        self.path = path
 
+    def _format(self) -> str:
+        return _CONTAINER_FILE_NOT_FOUND % (self.path, self.container_id)
 
-@_attr.s(frozen=True, auto_exc=True, auto_attribs=True)
+
+@_attr.s(slots=True, eq=False, auto_attribs=True)
 class ContainerFileAlreadyExists(DockerBladeException):
     """A file already exists at a given path inside a container."""
     container_id: str
     path: str
 
-    def __str__(self) -> str:
-        return (f"File already exists [{self.path}] "
-                f"in container [{self.container_id}]")
+    def _format(self) -> str:
+        return _CONTAINER_FILE_ALREADY_EXISTS % (self.path, self.container_id)
 
 
-@_attr.s(frozen=True, auto_exc=True, auto_attribs=True)
 class CalledProcessError(DockerBladeException, _subprocess.CalledProcessError):
     """Thrown when a process produces a non-zero return code.
 
@@ -128,13 +204,25 @@ class CalledProcessError(DockerBladeException, _subprocess.CalledProcessError):
     output: T, optional
         The output, if any, that was produced by the process.
     """
-    cmd: str
-    returncode: int
-    duration: float
-    output: str | bytes | None
+    # slots are listed in the order in which they appear in repr
+    __slots__ = ("cmd", "returncode", "duration", "output")  # noqa: RUF023
+
+    def __init__(self,
+                 cmd: str,
+                 returncode: int,
+                 duration: float,
+                 output: str | bytes | None = None,
+                 ) -> None:
+        """Records the details of the process without formatting a message."""
+        # bypasses subprocess.CalledProcessError.__init__, which expects its
+        # arguments in a different order
+        Exception.__init__(self, cmd, returncode, duration, output)
+        self.cmd = cmd
+        self.returncode = returncode
+        self.duration = duration
+        self.output = output
 
 
-@_attr.s(frozen=True, auto_exc=True, auto_attribs=True)
 class TimeoutExpired(DockerBladeException, _subprocess.TimeoutExpired):
     """Thrown when a timeout expires while waiting for a process.
 
@@ -145,5 +233,12 @@ class TimeoutExpired(DockerBladeException, _subprocess.TimeoutExpired):
     timeout: float
         The timeout in seconds.
     """
-    cmd: str
-    timeout: float
+    __slots__ = ("cmd", "timeout")
+
+    def __init__(self, cmd: str, timeout: float) -> None:
+        """Records the command and timeout without formatting a message."""
+        # bypasses subprocess.TimeoutExpired.__init__, as with
+        # CalledProcessError
+        Exception.__init__(self, cmd, timeout)
+        self.cmd = cmd
+        self.timeout = timeout
@@ -3,33 +3,200 @@ from __future__ import annotations
 __all__ = ("FileSystem",)
 
 import contextlib
+import enum
+import fnmatch
 import io
 import os
-import subprocess
+import posixpath
+import shutil
 import tarfile
-import tempfile
+import threading
+import time
 import typing
-from pathlib import Path
-from subprocess import DEVNULL
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
 from typing import Literal, overload
 
 import attr
+import docker
 from loguru import logger
 
 import dockerblade.exceptions as exc
-from dockerblade.util import quote_container, quote_host
+from dockerblade.shell import _ShellSession
+from dockerblade.stopwatch import Stopwatch
+from dockerblade.util import quote_container
 
 if typing.TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from _typeshed import WriteableBuffer
 
     from dockerblade.container import Container
     from dockerblade.shell import Shell
 
-_ON_WINDOWS = os.name == "nt"
-
 EXIT_CODE_FILE_NOT_FOUND = 50
 EXIT_CODE_IS_NOT_A_DIRECTORY = 51
 EXIT_CODE_FILE_ALREADY_EXISTS = 49
+EXIT_CODE_IS_A_DIRECTORY = 52
+
+# the directory bit of the Go os.FileMode reported by the archive API
+_GO_MODE_DIR = 1 << 31
+
+# the size of the buffers used when streaming archives from the container
+_STREAM_BUFFER_SIZE = 1 << 20
+
+
+class _StatFlag(enum.IntFlag):
+    """Describes the type of file, if any, that exists at a given path."""
+    EXISTS = 1
+    FILE = 2
+    DIR = 4
+    LINK = 8
+
+
+# computes a bitmask of _StatFlag for the path given by the shell variable p
+_STAT_SCRIPT = (
+    "f=0; "
+    f'test -e "$p" && f=$((f|{_StatFlag.EXISTS:d})); '
+    f'test -f "$p" && f=$((f|{_StatFlag.FILE:d})); '
+    f'test -d "$p" && f=$((f|{_StatFlag.DIR:d})); '
+    f'test -h "$p" && f=$((f|{_StatFlag.LINK:d})); '
+    'printf %d "$f"'
+)
+
+
+def _describe_error(error: Exception) -> str:
+    """Gives the most specific available description of an error."""
+    # for API errors, this is the message reported by the daemon
+    explanation = getattr(error, "explanation", None)
+    return str(explanation or error)
+
+
+def _tar_file(name: str, contents: str | bytes) -> bytes:
+    """Builds an in-memory tar archive that contains a single file."""
+    if isinstance(contents, str):
+        contents = contents.encode("utf-8")
+    tar_stream = io.BytesIO()
+    with tarfile.open(fileobj=tar_stream, mode="w") as tar:
+        tarinfo = tarfile.TarInfo(name=name)
+        tarinfo.size = len(contents)
+        tar.addfile(tarinfo, io.BytesIO(contents))
+    return tar_stream.getvalue()
+
+
+class _ChunkReader(io.RawIOBase):
+    """Provides a readable stream over an iterable of byte chunks."""
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        """Wraps the given chunks, which are consumed as the stream is read."""
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: WriteableBuffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
+        view = memoryview(buffer).cast("B")
+        size = min(len(view), len(self._pending))
+        view[:size] = self._pending[:size]
+        # advances through the chunk without copying its remainder
+        self._pending = self._pending[size:]
+        return size
+
+
+@contextlib.contextmanager
+def _open_archive(chunks: Iterable[bytes]) -> Iterator[tarfile.TarFile]:
+    """Opens a streamed tar archive for reading using large buffers.
+
+    Once the archive has been read without error, the remainder of the stream
+    is consumed, so that the connection that it came from can be reused.
+    """
+    fileobj = io.BufferedReader(_ChunkReader(chunks),
+                                buffer_size=_STREAM_BUFFER_SIZE)
+    with tarfile.open(fileobj=fileobj,
+                      mode="r|",
+                      bufsize=_STREAM_BUFFER_SIZE) as tar:
+        yield tar
+    fileobj.read()
+
+
+def _extract_archive(chunks: Iterable[bytes], path: str, name: str) -> None:
+    """Extracts a streamed single-rooted tar archive to a given directory.
+
+    The root of the archive is renamed to :code:`name`, and ownership of the
+    extracted files is given to the current user, as with :code:`docker cp`.
+    """
+    uid, gid = os.getuid(), os.getgid()
+    with _open_archive(chunks) as tar:
+        for member in tar:
+            root, sep, rest = member.name.partition("/")
+            member.name = name + sep + rest
+            if member.islnk() and member.linkname.startswith(root + "/"):
+                member.linkname = name + member.linkname[len(root):]
+            member.uid, member.gid = uid, gid
+            member.uname = member.gname = ""
+            if hasattr(tarfile, "tar_filter"):
+                tar.extract(member, path, filter=_extraction_filter)
+            else:
+                tar.extract(member, path)
+
+
+def _extraction_filter(member: tarfile.TarInfo, path: str) -> tarfile.TarInfo | None:
+    """Rejects unsafe archive members while preserving their permissions.
+
+    Applies the checks of the :code:`"tar"` extraction filter (e.g., against
+    absolute paths and paths that escape the destination), but, as with
+    :code:`docker cp`, leaves the mode of each member unchanged.
+    """
+    filtered = tarfile.tar_filter(member, path)
+    if filtered is None or member.mode is None:
+        return filtered
+    return filtered.replace(mode=member.mode, deep=False)
+
+
+class _ArchiveStream:
+    """Builds a tar archive of a file or directory tree on the host on demand.
+
+    The archive is written by a background thread into a pipe, and is read
+    back in chunks as it is consumed, so that it is never held in memory or
+    written to disk in its entirety. Any error encountered while building
+    the archive is reported by :meth:`close`.
+    """
+    def __init__(self, path: str, arcname: str) -> None:
+        read_fd, write_fd = os.pipe()
+        self._reader = os.fdopen(read_fd, "rb", buffering=0)
+        self._writer = os.fdopen(write_fd, "wb", buffering=_STREAM_BUFFER_SIZE)
+        self._error: Exception | None = None
+        self._thread = threading.Thread(target=self._write,
+                                        args=(path, arcname),
+                                        daemon=True)
+        self._thread.start()
+
+    def _write(self, path: str, arcname: str) -> None:
+        try:
+            with self._writer, tarfile.open(fileobj=self._writer, mode="w|") as tar:
+                # as with -L, only a link at the source path itself is followed
+                tar.add(os.path.realpath(path), arcname=arcname)
+        except BrokenPipeError:
+            # the consumer stopped reading, and will report why
+            pass
+        except Exception as error:  # noqa: BLE001
+            # reported on the consuming thread by close
+            self._error = error
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(lambda: self._reader.read(_STREAM_BUFFER_SIZE), b"")
+
+    def close(self) -> None:
+        """Waits for the archive to be built and raises any resulting error."""
+        self._reader.close()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
 
 
 @attr.s(slots=True)
@@ -43,6 +210,119 @@ class FileSystem:
     """
     container: Container = attr.ib()
     _shell: Shell = attr.ib(repr=False, eq=False, hash=False)
+    _stat_cache: dict[str, tuple[float, _StatFlag]] | None = \
+        attr.ib(init=False, default=None, repr=False, eq=False, hash=False)
+    _stat_cache_ttl: float = \
+        attr.ib(init=False, default=0.0, repr=False, eq=False, hash=False)
+    _session: _ShellSession | None = \
+        attr.ib(init=False, default=None, repr=False, eq=False, hash=False)
+
+    def _view(self) -> FileSystem:
+        """Creates a view of this filesystem with its own copy of its state."""
+        view = FileSystem(self.container, self._shell)
+        view._stat_cache = self._stat_cache
+        view._stat_cache_ttl = self._stat_cache_ttl
+        view._session = self._session
+        return view
+
+    @contextlib.contextmanager
+    def stat_cache(self, ttl: float = 1.0) -> Iterator[FileSystem]:
+        """Caches the types of files within a context.
+
+        Provides a view of this filesystem on which the results of
+        :meth:`exists`, :meth:`isfile`, :meth:`isdir`, and :meth:`islink` are
+        reused for up to :code:`ttl` seconds. The cache belongs to the view
+        alone, and so does not affect other users of this filesystem. Changes
+        made via the view invalidate the affected paths, but changes made by
+        other means (e.g., by running commands in a shell, or via this
+        filesystem) are not noticed. Only use this cache when the relevant
+        parts of the filesystem are otherwise stable.
+
+        Parameters
+        ----------
+        ttl: float
+            The number of seconds for which a cached file type may be reused.
+
+        Yields
+        ------
+        FileSystem
+            A view of this filesystem that caches the types of files.
+        """
+        view = self._view()
+        view._stat_cache = {}
+        view._stat_cache_ttl = ttl
+        yield view
+
+    @contextlib.contextmanager
+    def persistent_shell(self) -> Iterator[FileSystem]:
+        """Answers queries via a single long-lived shell within a context.
+
+        Provides a view of this filesystem on which the commands issued by
+        :meth:`exists`, :meth:`isfile`, :meth:`isdir`, :meth:`islink`, their
+        batched counterparts, :meth:`access`, :meth:`find`, and
+        :meth:`listdir` are sent to a shell that is kept open inside the
+        container, rather than each starting a fresh exec instance. This
+        greatly reduces the latency of each query, and is worthwhile whenever
+        many such queries are made in quick succession. The shell belongs to
+        the view alone, and is terminated upon leaving the context.
+
+        Yields
+        ------
+        FileSystem
+            A view of this filesystem that uses the persistent shell.
+        """
+        if self._session is not None:
+            yield self
+            return
+
+        session = _ShellSession.open(self._shell)
+        view = self._view()
+        view._session = session
+        try:
+            yield view
+        finally:
+            view._session = None
+            session.close()
+
+    def _check_output(self, command: str) -> str:
+        """Executes a read-only command via the persistent shell, if any."""
+        if self._session is not None:
+            return self._session.check_output(command)
+        # the shell runs commands via a tty, which turns each LF into CRLF
+        output = self._shell.check_output(command, text=True)
+        return output.replace("\r\n", "\n")
+
+    def _invalidate(self, path: str, *, ancestors: bool = False) -> None:
+        """Discards cached file types that a change to a given path affects.
+
+        This covers the path itself, its parent directory, and, if the path
+        is a directory, everything beneath it. If :code:`ancestors` is set,
+        every directory above the path is also covered, as is needed after
+        missing parent directories may have been created.
+        """
+        cache = self._stat_cache
+        if not cache:
+            return
+        path = posixpath.normpath(path)
+        affected = {path, posixpath.dirname(path)}
+        if ancestors:
+            affected.update(str(p) for p in PurePosixPath(path).parents)
+        prefix = path.rstrip("/") + "/"
+        # iterates over a snapshot, as copies may run in several threads
+        for cached_path in list(cache):
+            if cached_path in affected or cached_path.startswith(prefix):
+                cache.pop(cached_path, None)
+
+    def _put_archive(
+        self,
+        data: bytes | typing.IO[bytes] | Iterator[bytes],
+        extract_to: str,
+    ) -> None:
+        self.container.daemon.api.put_archive(
+            self.container.id,
+            extract_to,
+            data,
+        )
 
     def put_archive(
         self,
@@ -50,10 +330,8 @@ class FileSystem:
         extract_to: str = "/",
     ) -> None:
         """Extracts a tar archive to the container."""
-        self.container._docker.put_archive(
-            extract_to,
-            data,
-        )
+        self._put_archive(data, extract_to)
+        self._invalidate(extract_to)
 
     def put(
         self,
@@ -61,22 +339,16 @@ class FileSystem:
         contents: str | bytes,
     ) -> None:
         """Writes a file to the container."""
-        if isinstance(contents, str):
-            contents = contents.encode("utf-8")
-
-        tar_stream = io.BytesIO()
-        with tarfile.open(fileobj=tar_stream, mode="w") as tar:
-            file_data = io.BytesIO(contents)
-            tarinfo = tarfile.TarInfo(name=path_container)
-            tarinfo.size = len(file_data.getvalue())
-            tar.addfile(tarinfo, file_data)
-        tar_stream.seek(0)
-
-        self.put_archive(tar_stream.getvalue(), extract_to="/")
+        self._put_archive(_tar_file(path_container, contents), extract_to="/")
+        self._invalidate(path_container)
 
     def copy_from_host(self, path_host: str, path_container: str) -> None:
         """Copies a given file or directory tree from the host to the container.
 
+        Mirrors the behavior of :code:`docker cp -L`: if the destination is an
+        existing directory, the source is copied into that directory;
+        otherwise, the source is copied to the destination path.
+
         Parameters
         ----------
         path_host: str
@@ -98,37 +370,33 @@ class FileSystem:
         if not os.path.exists(path_host):
             raise exc.HostFileNotFound(path_host)
 
-        path_host_escaped = quote_host(path_host)
-        path_container_escaped = quote_host(path_container)
-
-        if _ON_WINDOWS:
-            if path_container_escaped[0] != '"':
-                path_container_escaped = f'"{path_container_escaped}"'
-            if path_host_escaped[0] != '"':
-                path_host_escaped = f'"{path_host_escaped}"'
+        if _StatFlag.DIR in self._stat(path_container):
+            extract_to = path_container
+            arcname = Path(path_host).name
+        else:
+            extract_to = os.path.dirname(path_container)
+            arcname = PurePosixPath(path_container).name
 
-        cmd: str = (f"docker cp -L {path_host_escaped} "
-                    f"{id_container}:{path_container_escaped}")
+        # the archive is streamed to the daemon as it is built, over the
+        # existing API connection
+        archive = _ArchiveStream(path_host, arcname)
         try:
-            subprocess.check_call(
-                cmd,
-                shell=True,
-                stdin=DEVNULL,
-                stdout=DEVNULL,
-                stderr=DEVNULL,
-            )
-        except subprocess.CalledProcessError as error:
-            path_container_parent: str = os.path.dirname(path_container)
-            if not self.isdir(path_container_parent):
-                raise exc.ContainerFileNotFound(
-                    path=path_container_parent,
-                    container_id=id_container,
-                ) from error
-
+            try:
+                self._put_archive(iter(archive), extract_to)
+            finally:
+                archive.close()
+        except docker.errors.NotFound as error:
+            raise exc.ContainerFileNotFound(
+                path=extract_to,
+                container_id=id_container,
+            ) from error
+        except (docker.errors.APIError, tarfile.TarError, OSError) as error:
             reason = (f"failed to copy file [{path_host}] "
                       f"from host to container [{id_container}]: "
-                      f"{path_container}")
+                      f"{path_container} ({_describe_error(error)})")
             raise exc.CopyFailed(reason) from error
+        finally:
+            self._invalidate(path_container)
 
     def copy_to_host(self,
                      path_container: str,
@@ -136,6 +404,10 @@ class FileSystem:
                      ) -> None:
         """Copies a given file or directory tree from the container to the host.
 
+        Mirrors the behavior of :code:`docker cp -L`: symbolic links at the
+        given container path are followed, and if the destination is an
+        existing directory, the source is copied into that directory.
+
         Parameters
         ----------
         path_container: str
@@ -158,38 +430,123 @@ class FileSystem:
         if not os.path.isdir(path_host_parent):
             raise exc.HostFileNotFound(path_host_parent)
 
-        path_host_escaped = quote_host(path_host)
-        path_container_escaped = quote_host(path_container)
-
-        if _ON_WINDOWS:
-            if path_container_escaped[0] != '"':
-                path_container_escaped = f'"{path_container_escaped}"'
-            if path_host_escaped[0] != '"':
-                path_host_escaped = f'"{path_host_escaped}"'
+        if os.path.isdir(path_host):
+            extract_to = path_host
+            name = PurePosixPath(path_container).name
+        else:
+            extract_to = path_host_parent
+            name = Path(path_host).name
 
-        cmd: str = (f"docker cp -L "
-                    f"{id_container}:{path_container_escaped} "
-                    f"{path_host_escaped}")
+        chunks, _ = self._get_archive(path_container)
         try:
-            subprocess.check_call(
-                cmd,
-                shell=True,
-                stdin=DEVNULL,
-                stdout=DEVNULL,
-                stderr=DEVNULL,
-            )
-        except subprocess.CalledProcessError as error:
-            if not self.exists(path_container):
-                raise exc.ContainerFileNotFound(
-                    path=path_container,
-                    container_id=id_container,
-                ) from error
-
+            _extract_archive(chunks, extract_to, name)
+        except (docker.errors.APIError, tarfile.TarError, OSError) as error:
             reason = (f"failed to copy file [{path_container}] "
                       f"from container [{id_container}] to host: "
-                      f"{path_host}")
+                      f"{path_host} ({_describe_error(error)})")
             raise exc.CopyFailed(reason) from error
 
+    def copy_many_from_host(
+        self,
+        pairs: Iterable[tuple[str, str]],
+        *,
+        max_workers: int = 4,
+    ) -> None:
+        """Concurrently copies several files or directory trees from the host.
+
+        Parameters
+        ----------
+        pairs: Iterable[tuple[str, str]]
+            the host and container paths for each copy, as would be given to
+            :meth:`copy_from_host`.
+        max_workers: int
+            the maximum number of copies that may be in progress at once.
+
+        Raises
+        ------
+        ExceptionGroup
+            if any of the copies failed, containing the exception raised by
+            each failed copy. All other copies are completed regardless.
+        """
+        self._copy_many(self.copy_from_host, pairs, max_workers=max_workers)
+
+    def copy_many_to_host(
+        self,
+        pairs: Iterable[tuple[str, str]],
+        *,
+        max_workers: int = 4,
+    ) -> None:
+        """Concurrently copies several files or directory trees to the host.
+
+        Parameters
+        ----------
+        pairs: Iterable[tuple[str, str]]
+            the container and host paths for each copy, as would be given to
+            :meth:`copy_to_host`.
+        max_workers: int
+            the maximum number of copies that may be in progress at once.
+
+        Raises
+        ------
+        ExceptionGroup
+            if any of the copies failed, containing the exception raised by
+            each failed copy. All other copies are completed regardless.
+        """
+        self._copy_many(self.copy_to_host, pairs, max_workers=max_workers)
+
+    @staticmethod
+    def _copy_many(
+        copy: typing.Callable[[str, str], None],
+        pairs: Iterable[tuple[str, str]],
+        *,
+        max_workers: int,
+    ) -> None:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(copy, src, dst) for src, dst in pairs]
+        errors: list[Exception] = []
+        for future in futures:
+            error = future.exception()
+            if isinstance(error, Exception):
+                errors.append(error)
+            elif error is not None:
+                raise error
+        if errors:
+            error_message = f"{len(errors)} of {len(futures)} copies failed"
+            raise ExceptionGroup(error_message, errors)
+
+    def _get_archive(
+        self,
+        path: str,
+    ) -> tuple[Iterator[bytes], dict[str, typing.Any]]:
+        """Streams a tar archive of a given file or directory in the container.
+
+        If the path is a symbolic link, the archive is taken from its target.
+
+        Returns
+        -------
+        tuple[Iterator[bytes], dict[str, typing.Any]]
+            The chunks of the archive, and the stat of the archived path.
+
+        Raises
+        ------
+        ContainerFileNotFound
+            If no file or directory exists at the given path.
+        """
+        api = self.container.daemon.api
+        try:
+            chunks, stat = api.get_archive(self.container.id, path)
+            link_target = stat.get("linkTarget")
+            if link_target:
+                for _ in chunks:
+                    pass
+                chunks, stat = api.get_archive(self.container.id, link_target)
+        except docker.errors.NotFound as error:
+            raise exc.ContainerFileNotFound(
+                path=path,
+                container_id=self.container.id,
+            ) from error
+        return chunks, stat
+
     def remove(self, filename: str) -> None:
         """Removes a given file.
 
@@ -208,17 +565,26 @@ class FileSystem:
         UnexpectedError
             if an unexpected failure occurs.
         """
-        command = f"rm {quote_container(filename)}"
+        filename_escaped = quote_container(filename)
+        command = (
+            # symbolic links are removed themselves, even when they dangle
+            # or point to a directory
+            f"{{ test -e {filename_escaped} || test -h {filename_escaped}; }} "
+            f"|| exit {EXIT_CODE_FILE_NOT_FOUND}; "
+            f"test -d {filename_escaped} && ! test -h {filename_escaped} "
+            f"&& exit {EXIT_CODE_IS_A_DIRECTORY}; "
+            f"rm {filename_escaped}"
+        )
         try:
             self._shell.check_call(command)
         except exc.CalledProcessError as error:
-            if not self.exists(filename):
+            if error.returncode == EXIT_CODE_FILE_NOT_FOUND:
                 raise exc.ContainerFileNotFound(
                     path=filename,
                     container_id=self.container.id,
                 ) from error
 
-            if self.isdir(filename):
+            if error.returncode == EXIT_CODE_IS_A_DIRECTORY:
                 raise exc.IsADirectoryError(
                     path=filename,
                 ) from error
@@ -228,6 +594,7 @@ class FileSystem:
                 error_message,
                 error,
             ) from error
+        self._invalidate(filename)
 
     def rmdir(self, directory: str) -> None:
         """Removes a given directory.
@@ -273,6 +640,7 @@ class FileSystem:
                     path=directory,
                 ) from error
             raise exc.UnexpectedError('failed to remove directory', error) from error  # noqa
+        self._invalidate(directory)
 
     def write(self, filename: str, contents: str | bytes) -> None:
         """Writes to a given file.
@@ -285,12 +653,19 @@ class FileSystem:
             the text or binary contents of the file.
         """
         directory = os.path.dirname(filename)
-        if not self.isdir(directory):
+        archive = _tar_file(PurePosixPath(filename).name, contents)
+        try:
+            self._put_archive(archive, extract_to=directory)
+        except docker.errors.APIError as error:
+            # the daemon refuses to extract to a missing path (404) or to
+            # anything other than a directory (400)
+            if error.status_code not in (400, 404):
+                raise
             raise exc.ContainerFileNotFound(
                 path=directory,
                 container_id=self.container.id,
-            )
-        self.put(filename, contents)
+            ) from error
+        self._invalidate(filename)
 
     @overload
     def read(self, filename: str) -> str:
@@ -322,16 +697,52 @@ class FileSystem:
         IsADirectoryError
             If :code:`filename` is a directory.
         """
-        mode = "rb" if binary else "r"
-        if self.isdir(filename):
+        with self._open_file(filename) as contents:
+            data = contents.read()
+
+        if binary:
+            return data
+        # decodes in the same way as reading the file in text mode would
+        with io.TextIOWrapper(io.BytesIO(data)) as text:
+            return text.read()
+
+    def read_into(self, filename: str, fileobj: typing.IO[bytes]) -> None:
+        """Writes the binary contents of a given file to a file object.
+
+        Unlike :meth:`read`, the contents are streamed from the container in
+        chunks, and are never held in memory in their entirety.
+
+        Parameters
+        ----------
+        filename: str
+            absolute path to the file.
+        fileobj: typing.IO[bytes]
+            the binary file object to which the contents should be written.
+
+        Raises
+        ------
+        ContainerFileNotFound
+            If no file exists at the given path.
+        IsADirectoryError
+            If :code:`filename` is a directory.
+        """
+        with self._open_file(filename) as contents:
+            shutil.copyfileobj(contents, fileobj, _STREAM_BUFFER_SIZE)
+
+    @contextlib.contextmanager
+    def _open_file(self, filename: str) -> Iterator[typing.IO[bytes]]:
+        """Opens a stream over the binary contents of a given file."""
+        chunks, stat = self._get_archive(filename)
+        if stat["mode"] & _GO_MODE_DIR:
             raise exc.IsADirectoryError(filename)
 
-        with tempfile.TemporaryDirectory() as host_temp_dir:
-            filename_host_temp = os.path.join(host_temp_dir, "contents")
-            self.copy_to_host(filename, filename_host_temp)
-            with open(filename_host_temp, mode) as f:
-                content: str | bytes = f.read()
-                return content
+        with _open_archive(chunks) as tar:
+            member = tar.next()
+            contents = tar.extractfile(member) if member else None
+            if contents is None:
+                error_message = f"failed to read file: {filename}"
+                raise exc.UnexpectedError(error_message)
+            yield contents
 
     def find(self, path: str, filename: str) -> list[str]:
         """Returns a list of files that match a filename in a directory, recursively.
@@ -358,33 +769,147 @@ class FileSystem:
             If an unexpected error occurred during the find operation.
         """
         # TODO execute as root
+        command = self._find_command(path, filename)
+        try:
+            output = self._check_output(command)
+        except exc.CalledProcessError as error:
+            raise self._find_error(path, error) from error
+        return [p for p in output.split("\0") if p]
+
+    def find_iter(self, path: str, filename: str) -> Iterator[str]:
+        """Lazily finds files that match a filename in a directory, recursively.
+
+        Unlike :meth:`find`, matching files are yielded as they are found,
+        without waiting for the search to complete or buffering its results.
+
+        Parameters
+        ----------
+        path: str
+            absolute path to the directory.
+        filename: str
+            the name of the file to match.
+
+        Yields
+        ------
+        str
+            The absolute path of each matching file.
+
+        Raises
+        ------
+        ContainerFileNotFound
+            If the given path belongs to a file.
+        IsNotADirectoryError
+            If the given path is not a directory.
+        UnexpectedError
+            If an unexpected error occurred during the find operation.
+        """
+        command = self._find_command(path, filename)
+        with Stopwatch() as timer:
+            process = self._shell.popen(command, encoding=None)
+            pending = b""
+            for chunk in process.stream:
+                assert isinstance(chunk, bytes)
+                *found, pending = (pending + chunk).split(b"\0")
+                for match in found:
+                    yield match.decode("utf-8")
+            if pending:
+                yield pending.decode("utf-8")
+            returncode = process.wait()
+        if returncode != 0:
+            error = exc.CalledProcessError(
+                cmd=command,
+                returncode=returncode,
+                duration=timer.duration,
+            )
+            raise self._find_error(path, error) from error
+
+    def find_many(
+        self,
+        path: str,
+        filenames: Iterable[str],
+    ) -> dict[str, list[str]]:
+        """Finds the files that match any of several filenames in a directory, recursively.
+
+        Unlike calling :meth:`find` for each filename, the directory is
+        traversed only once, by a single command.
+
+        Parameters
+        ----------
+        path: str
+            absolute path to the directory.
+        filenames: Iterable[str]
+            the names of the files to match.
+
+        Returns
+        -------
+        dict[str, list[str]]
+            A mapping from each given filename to the absolute paths of the
+            files that match it, in the order given by :meth:`find`.
+
+        Raises
+        ------
+        ContainerFileNotFound
+            If the given path belongs to a file.
+        IsNotADirectoryError
+            If the given path is not a directory.
+        UnexpectedError
+            If an unexpected error occurred during the find operation.
+        """
+        filenames = list(dict.fromkeys(filenames))
+        matches: dict[str, list[str]] = {filename: [] for filename in filenames}
+        if not filenames:
+            return matches
+
+        command = self._find_command(path, *filenames)
+        try:
+            output = self._check_output(command)
+        except exc.CalledProcessError as error:
+            raise self._find_error(path, error) from error
+
+        # as with find -name, filenames are matched against base names
+        for found in output.split("\0"):
+            if not found:
+                continue
+            name = posixpath.basename(found)
+            for filename in filenames:
+                if fnmatch.fnmatchcase(name, filename):
+                    matches[filename].append(found)
+        return matches
+
+    @staticmethod
+    def _find_command(path: str, *filenames: str) -> str:
         path_escaped = quote_container(path)
-        command = (
+        names = " -o ".join(
+            f"-name {quote_container(filename)}" for filename in filenames
+        )
+        if len(filenames) > 1:
+            names = f"\\( {names} \\)"
+        return (
             f"test ! -e {path_escaped} && exit {EXIT_CODE_FILE_NOT_FOUND} || "
             f"test ! -d {path_escaped} && exit {EXIT_CODE_IS_NOT_A_DIRECTORY} || "
-            f"find {path_escaped} -name {quote_container(filename)}"
+            f"find {path_escaped} {names} -print0"
         )
-        try:
-            output = self._shell.check_output(command, text=True)
-        except exc.CalledProcessError as error:
-            if error.returncode == EXIT_CODE_FILE_NOT_FOUND:
-                raise exc.ContainerFileNotFound(
-                    path=path,
-                    container_id=self.container.id,
-                ) from error
-            if error.returncode == EXIT_CODE_IS_NOT_A_DIRECTORY:
-                raise exc.IsNotADirectoryError(
-                    path=path,
-                ) from error
 
-            error_message = "find failed"
-            raise exc.UnexpectedError(
-                error_message,
-                error=error,
-            ) from error
-
-        paths: list[str] = output.replace("\r", "").split("\n")
-        return paths
+    def _find_error(
+        self,
+        path: str,
+        error: exc.CalledProcessError,
+    ) -> exc.DockerBladeException:
+        """Describes why a given find command failed."""
+        if error.returncode == EXIT_CODE_FILE_NOT_FOUND:
+            return exc.ContainerFileNotFound(
+                path=path,
+                container_id=self.container.id,
+            )
+        if error.returncode == EXIT_CODE_IS_NOT_A_DIRECTORY:
+            return exc.IsNotADirectoryError(
+                path=path,
+            )
+        error_message = "find failed"
+        return exc.UnexpectedError(
+            error_message,
+            error=error,
+        )
 
     def makedirs(self, d: str, *, exist_ok: bool = False) -> None:
         """Recursively creates a directory at a given path, creating any missing intermediate directories along the way.
@@ -407,26 +932,112 @@ class FileSystem:
         IsNotADirectoryError
             if the parent directory isn't a directory.
         """
+        d_escaped = quote_container(d)
         d_parent = os.path.dirname(d)
-        if self.isdir(d) and not exist_ok:
-            raise exc.ContainerFileAlreadyExists(path=d,
-                                                 container_id=self.container.id)
-        if self.isfile(d):
-            raise exc.ContainerFileAlreadyExists(path=d,
-                                                 container_id=self.container.id)
-        if self.exists(d_parent) and self.isfile(d_parent):
-            raise exc.IsNotADirectoryError(d_parent)
-
-        command = f"mkdir -p {quote_container(d)}"
-        self._shell.check_call(command)
+        d_parent_escaped = quote_container(d_parent)
+        checks = [] if exist_ok else [
+            f"test -d {d_escaped} && exit {EXIT_CODE_FILE_ALREADY_EXISTS}; ",
+        ]
+        checks += [
+            f"test -f {d_escaped} && exit {EXIT_CODE_FILE_ALREADY_EXISTS}; ",
+            f"test -f {d_parent_escaped} && exit {EXIT_CODE_IS_NOT_A_DIRECTORY}; ",
+        ]
+        command = "".join(checks) + f"mkdir -p {d_escaped}"
+        try:
+            self._shell.check_call(command)
+        except exc.CalledProcessError as error:
+            if error.returncode == EXIT_CODE_FILE_ALREADY_EXISTS:
+                raise exc.ContainerFileAlreadyExists(
+                    path=d,
+                    container_id=self.container.id) from error
+            if error.returncode == EXIT_CODE_IS_NOT_A_DIRECTORY:
+                raise exc.IsNotADirectoryError(d_parent) from error
+            raise
+        self._invalidate(d, ancestors=True)
+
+    def _stat(self, path: str) -> _StatFlag:
+        """Determines the type of file, if any, at a given path.
+
+        All of the file type tests are performed by a single command, so that
+        callers that need more than one of them only pay for a single trip to
+        the container.
+        """
+        return self._stat_many([path])[0]
+
+    def _stat_many(self, paths: Sequence[str]) -> list[_StatFlag]:
+        """Determines the types of files, if any, at several paths.
+
+        Any paths that are not in the cache are tested by a single command,
+        regardless of their number.
+        """
+        cache = self._stat_cache
+        if cache is not None:
+            paths = [posixpath.normpath(path) for path in paths]
+        flags: list[_StatFlag | None] = [None] * len(paths)
+        if cache is not None:
+            now = time.monotonic()
+            for i, path in enumerate(paths):
+                cached = cache.get(path)
+                if cached and now - cached[0] < self._stat_cache_ttl:
+                    flags[i] = cached[1]
+
+        missing = [i for i, flag in enumerate(flags) if flag is None]
+        if missing:
+            quoted = " ".join(quote_container(paths[i]) for i in missing)
+            command = f"for p in {quoted}; do {_STAT_SCRIPT}; echo; done"
+            output = self._check_output(command)
+            for i, line in zip(missing, output.split("\n"), strict=True):
+                flag = _StatFlag(int(line))
+                flags[i] = flag
+                if cache is not None:
+                    cache[paths[i]] = (time.monotonic(), flag)
+        return typing.cast("list[_StatFlag]", flags)
 
     def exists(self, path: str) -> bool:
         """Determines whether a file or directory exists at the given path.
 
         Inspired by :meth:`os.path.exists`.
         """
-        cmd = f"test -e {quote_container(path)}"
-        return self._shell.run(cmd, stdout=False).returncode == 0
+        return _StatFlag.EXISTS in self._stat(path)
+
+    def exists_many(self, paths: Iterable[str]) -> dict[str, bool]:
+        """Determines whether files or directories exist at several paths.
+
+        Unlike calling :meth:`exists` for each path, all of the paths are
+        checked by a single command.
+
+        Returns
+        -------
+        dict[str, bool]
+            A mapping from each given path to whether anything exists there.
+        """
+        return self._test_many(paths, _StatFlag.EXISTS)
+
+    def isfile_many(self, paths: Iterable[str]) -> dict[str, bool]:
+        """Determines whether regular files exist at several paths.
+
+        As with :meth:`exists_many`, all of the paths are checked by a single
+        command.
+        """
+        return self._test_many(paths, _StatFlag.FILE)
+
+    def isdir_many(self, paths: Iterable[str]) -> dict[str, bool]:
+        """Determines whether directories exist at several paths.
+
+        As with :meth:`exists_many`, all of the paths are checked by a single
+        command.
+        """
+        return self._test_many(paths, _StatFlag.DIR)
+
+    def _test_many(self, paths: Iterable[str], flag: _StatFlag) -> dict[str, bool]:
+        paths = list(paths)
+        if not paths:
+            return {}
+        flags = self._stat_many(paths)
+        return {
+            path: flag in flags_path
+            for path, flags_path in zip(paths, flags, strict=True)
+        }
 
     def mkdir(self, directory: str) -> None:
         """Creates a directory at a given path.
@@ -473,6 +1084,7 @@ class FileSystem:
                 error_message,
                 error,
             ) from error
+        self._invalidate(directory)
 
     def listdir(self,
                 directory: str,
@@ -504,10 +1116,10 @@ class FileSystem:
         command = (
             f"test -e {directory_escaped} || exit {EXIT_CODE_FILE_NOT_FOUND} && "
             f"test -d {directory_escaped} || exit {EXIT_CODE_IS_NOT_A_DIRECTORY} && "
-            f"ls --color=never -A -1 {directory_escaped}"
+            f"cd {directory_escaped} && find . -mindepth 1 -maxdepth 1 -print0"
         )
         try:
-            output = self._shell.check_output(command, text=True)
+            output = self._check_output(command)
         except exc.CalledProcessError as error:
             if error.returncode == EXIT_CODE_FILE_NOT_FOUND:
                 raise exc.ContainerFileNotFound(
@@ -520,34 +1132,34 @@ class FileSystem:
                 ) from error
             raise
 
-        paths: list[str] = output.replace("\r", "").split("\n")
+        # names are NUL-delimited, as they may themselves contain newlines,
+        # and are given relative to the directory (i.e., prefixed by "./")
+        names = sorted(name[2:] for name in output.split("\0") if name)
         if absolute:
-            paths = [os.path.join(directory, path) for path in paths]
-        return paths
+            prefix = directory.rstrip("/") + "/"
+            return [prefix + name for name in names]
+        return names
 
     def isfile(self, path: str) -> bool:
         """Determines whether a regular file exists at a given path.
 
         Inspired by :meth:`os.path.isfile`.
         """
-        cmd = f"test -f {quote_container(path)}"
-        return self._shell.run(cmd, stdout=False).returncode == 0
+        return _StatFlag.FILE in self._stat(path)
 
     def isdir(self, path: str) -> bool:
         """Determines whether a directory exists at a given path.
 
         Inspired by :meth:`os.path.dir`.
         """
-        cmd = f"test -d {quote_container(path)}"
-        return self._shell.run(cmd, stdout=False).returncode == 0
+        return _StatFlag.DIR in self._stat(path)
 
     def islink(self, path: str) -> bool:
         """Determines whether a symbolic link exists at a given path.
 
         Inspired by :meth:`os.path.islink`.
         """
-        cmd = f"test -h {quote_container(path)}"
-        return self._shell.run(cmd, stdout=False).returncode == 0
+        return _StatFlag.LINK in self._stat(path)
 
     def access(self, path: str, mode: int) -> bool:
         """Determines whether the shell user can perform an operation (e.g., existence, read, write, execute).
@@ -587,8 +1199,11 @@ class FileSystem:
             return False
 
         command = " && ".join(commands)
-        outcome = self._shell.run(command, stdout=False, stderr=False)
-        return outcome.returncode == 0
+        try:
+            self._check_output(command)
+        except exc.CalledProcessError:
+            return False
+        return True
 
     def patch(self, context: str, diff: str) -> None:
         """Attempts to atomically apply a given patch to the filesystem.
@@ -619,20 +1234,25 @@ class FileSystem:
             error = f"context must be supplied as an absolute path: {context}"
             raise ValueError(error)
 
-        with self.tempfile(suffix=".diff") as fn_diff:
-            self.write(fn_diff, diff)
-
-            safe_context = quote_container(context)
-            safe_fn_diff = quote_container(fn_diff)
-            if self.isdir(context):
-                cmd = f"patch -u -p0 -f -i {safe_fn_diff} -d {safe_context}"
-            elif self.isfile(context):
-                cmd = f"patch -u -f -i {safe_fn_diff} {safe_context}"
-            else:
-                raise exc.ContainerFileNotFound(path=context,
-                                                container_id=self.container.id)
-
-            self._shell.check_call(cmd)
+        # the diff is handed to patch via its stdin, avoiding a temporary file
+        safe_context = quote_container(context)
+        cmd = (
+            f"if test -d {safe_context}; then "
+            f"patch -u -p0 -f -d {safe_context}; "
+            f"elif test -f {safe_context}; then "
+            f"patch -u -f {safe_context}; "
+            f"else exit {EXIT_CODE_FILE_NOT_FOUND}; fi"
+        )
+        try:
+            self._shell.check_call(cmd, stdin=diff.encode("utf-8"))
+        except exc.CalledProcessError as error:
+            if error.returncode == EXIT_CODE_FILE_NOT_FOUND:
+                raise exc.ContainerFileNotFound(
+                    path=context,
+                    container_id=self.container.id,
+                ) from error
+            raise
+        self._invalidate(context)
 
     def mktemp(
         self,
@@ -666,19 +1286,31 @@ class FileSystem:
         """
         template = quote_container(f"{prefix if prefix else 'tmp'}.XXXXXXXXXX")
         dirname = dirname if dirname else "/tmp"
-        cmd_parts = ("mktemp", template, "-p", quote_container(dirname))
-        if not self.isdir(dirname):
-            raise exc.ContainerFileNotFound(path=dirname,
-                                            container_id=self.container.id)
-        command = " ".join(cmd_parts)
-        filename = self._shell.check_output(command, text=True)
-
+        dirname_escaped = quote_container(dirname)
+        create = f"mktemp {template} -p {dirname_escaped}"
         if suffix:
-            original_filename = filename
-            filename = original_filename + suffix
-            command = f"mv {original_filename} {filename}"
-            self._shell.check_call(command)
+            # mktemp cannot portably add a suffix, so the file is renamed by
+            # the same command rather than by a second trip to the container
+            suffix_escaped = quote_container(suffix)
+            create = (
+                f"f=$({create}) && "
+                f'mv "$f" "$f"{suffix_escaped} && printf %s "$f"{suffix_escaped}'
+            )
+        command = (
+            f"test -d {dirname_escaped} || exit {EXIT_CODE_FILE_NOT_FOUND}; "
+            f"{create}"
+        )
+        try:
+            filename = self._shell.check_output(command, text=True)
+        except exc.CalledProcessError as error:
+            if error.returncode == EXIT_CODE_FILE_NOT_FOUND:
+                raise exc.ContainerFileNotFound(
+                    path=dirname,
+                    container_id=self.container.id,
+                ) from error
+            raise
 
+        self._invalidate(filename)
         return filename
 
     @contextlib.contextmanager
@@ -707,4 +1339,4 @@ class FileSystem:
         try:
             self.remove(filename)
         except exc.ContainerFileNotFound:
-            logger.debug("temporary file already destroyed: %s", filename)
+            logger.debug("temporary file already destroyed: {}", filename)
@@ -21,15 +21,19 @@ if t.TYPE_CHECKING:
 
     from .container import Container
 
+# the bounds, in seconds, on the delay between checks for process termination
+_POLL_DELAY_MIN = 0.001
+_POLL_DELAY_MAX = 0.05
 
 
 def host_pid_to_container_pid(pid_host: int) -> int | None:
-    fn_proc = Path(f"/proc/{pid_host}/status")
-    with fn_proc.open() as fh:
-        for line in fh:
-            if line.startswith("NSpid:"):
-                return int(line.split()[2])
-    return None
+    status = Path(f"/proc/{pid_host}/status").read_bytes()
+    start = status.find(b"\nNSpid:")
+    if start < 0:
+        return None
+    end = status.find(b"\n", start + 1)
+    line = status[start + 1:end if end >= 0 else None]
+    return int(line.split()[2])
 
 
 @attr.s(slots=True, eq=False, hash=False)
@@ -89,10 +93,17 @@ class Popen:
         else:
             yield from decoded_stream()
 
+    def _refresh(self) -> None:
+        """Updates the host PID and exit code from a single inspection."""
+        info = self._inspect()
+        if not self._pid_host:
+            self._pid_host = info["Pid"]
+        self._returncode = info["ExitCode"]
+
     @property
     def host_pid(self) -> int | None:
         if not self._pid_host:
-            self._pid_host = self._inspect()["Pid"]
+            self._refresh()
         return self._pid_host
 
     @property
@@ -108,8 +119,9 @@ class Popen:
 
     @property
     def returncode(self) -> int | None:
+        # the exit code never changes once it is known
         if self._returncode is None:
-            self._returncode = self._inspect()["ExitCode"]
+            self._refresh()
         return self._returncode
 
     def send_signal(self, sig: int) -> None:
@@ -121,12 +133,15 @@ class Popen:
             The signal number.
         """
         pid = self.pid
-        docker_container = self._container._docker
-        logger.debug(f"sending signal {sig} to process {pid}")
+        logger.debug("sending signal {} to process {}", sig, pid)
         cmd = f"kill -{sig} -{pid}"
         if pid:
-            docker_container.exec_run(cmd,
-                                      stdout=False, stderr=False, user="root")
+            exec_id = self._docker_api.exec_create(self._container.id,
+                                                   cmd,
+                                                   stdout=False,
+                                                   stderr=False,
+                                                   user="root")["Id"]
+            self._docker_api.exec_start(exec_id)
 
     def kill(self) -> None:
         """Kills the process via a SIGKILL signal."""
@@ -155,10 +170,14 @@ class Popen:
         """
         stopwatch = Stopwatch()
         stopwatch.start()
+        # polls quickly at first, so that short-lived processes are noticed
+        # promptly, then backs off to limit the load on the daemon
+        delay = _POLL_DELAY_MIN
         while not self.finished:
             if time_limit and stopwatch.duration > time_limit:
                 logger.debug("timeout")
                 raise TimeoutExpired(self.args, time_limit)
-            time.sleep(0.05)
+            time.sleep(delay)
+            delay = min(delay * 2, _POLL_DELAY_MAX)
         assert self.returncode is not None
         return self.returncode
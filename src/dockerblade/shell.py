@@ -6,15 +6,24 @@ __all__ = (
     "Shell",
 )
 
+import threading
 import typing as t
+import uuid
 from pathlib import Path
+from socket import SHUT_WR
 from typing import Literal
 
 import attr
 import psutil
+from docker.utils.socket import frames_iter
 from loguru import logger
 
-from .exceptions import CalledProcessError, ContainerFileNotFound, EnvNotFoundError
+from .exceptions import (
+    CalledProcessError,
+    ContainerFileNotFound,
+    EnvNotFoundError,
+    UnexpectedError,
+)
 from .popen import Popen
 from .stopwatch import Stopwatch
 from .util import quote_container
@@ -23,6 +32,35 @@ if t.TYPE_CHECKING:
     from .container import Container
 
 
+@t.runtime_checkable
+class _Socket(t.Protocol):
+    """The parts of a socket that are used to talk to an attached exec."""
+    def sendall(self, data: bytes, /) -> None: ...
+    def recv(self, bufsize: int, /) -> bytes: ...
+    def shutdown(self, how: int, /) -> None: ...
+    def close(self) -> None: ...
+
+
+def _unwrap_socket(socket: object) -> _Socket:
+    """Finds the underlying socket of a socket returned by docker-py.
+
+    For most connection types, docker-py hands back a :class:`SocketIO`
+    wrapper, whose socket is only reachable via its private :code:`_sock`
+    attribute. Should that ever change, this fails loudly rather than
+    returning the wrapper, which cannot be written to directly.
+
+    Raises
+    ------
+    TypeError
+        If no usable socket could be found.
+    """
+    raw_socket = getattr(socket, "_sock", socket)
+    if not isinstance(raw_socket, _Socket):
+        error_message = f"unsupported socket returned by docker-py: {socket!r}"
+        raise TypeError(error_message)
+    return raw_socket
+
+
 @attr.s(auto_attribs=True, frozen=True)
 class CompletedProcess:
     """Stores the result of a completed process.
@@ -132,7 +170,8 @@ class Shell:
         """
         container = self.container
         ctr_pids = [container.pid]
-        info = container._info
+        # exec sessions come and go, so never rely on a cached list of them
+        info = container._info(refresh=True)
         ctr_pids += \
             [container._exec_id_to_host_pid(i) for i in info["ExecIDs"]]
 
@@ -164,19 +203,20 @@ class Shell:
                     *,
                     time_limit: int | None = None,
                     kill_after: int = 1,
-                    ) -> str:
-        q = quote_container
-        logger.debug(f"instrumenting command: {command}")
-        command = f"{self.path} -c {q(command)}"
+                    ) -> list[str]:
+        # the command is given to the shell as a single argument, rather than
+        # as a string that the Docker client would have to split and unquote
+        logger.debug("instrumenting command: {}", command)
+        argv = [self.path, "-c", command]
         if time_limit:
-            command = (f"timeout --kill-after={kill_after} "
-                       f"--signal=SIGTERM {time_limit} {command}")
-        logger.debug(f"instrumented command: {command}")
-        return command
+            argv = ["timeout", f"--kill-after={kill_after}",
+                    "--signal=SIGTERM", str(time_limit), *argv]
+        logger.debug("instrumented command: {}", argv)
+        return argv
 
     def send_signal(self, pid: int, sig: int) -> None:
         # FIXME run as root!
-        logger.debug(f"sending signal {sig} to process {pid}")
+        logger.debug("sending signal {} to process {}", sig, pid)
         cmd = f"kill -{sig} {pid}"
         self.run(cmd)
 
@@ -188,10 +228,11 @@ class Shell:
         EnvNotFoundError
             if no environment variable exists with the given name.
         """
-        try:
-            return self._environment[var]
-        except KeyError as exc:
-            raise EnvNotFoundError(var) from exc
+        # avoids raising (and chaining onto) a KeyError for missing variables
+        value = self._environment.get(var)
+        if value is None:
+            raise EnvNotFoundError(var)
+        return value
 
     def check_call(
         self,
@@ -201,9 +242,13 @@ class Shell:
         time_limit: int | None = None,  # noqa: ARG002
         kill_after: int = 1,            # noqa: ARG002
         environment: t.Mapping[str, str] | None = None,
+        stdin: bytes | None = None,
     ) -> None:
         """Executes a given commands, blocks until completion, and checks return code is zero.
 
+        If :code:`stdin` is given, it is supplied to the command via its
+        standard input.
+
         Raises
         ------
         CalledProcessError
@@ -214,6 +259,7 @@ class Shell:
             stdout=False,
             cwd=cwd,
             environment=environment,
+            stdin=stdin,
         ).check_returncode()
 
     @t.overload
@@ -297,6 +343,7 @@ class Shell:
         time_limit: int | None = None,
         kill_after: int = 1,
         environment: t.Mapping[str, str] | None = None,
+        stdin: bytes | None = None,
     ) -> CompletedProcess:
         """Executes a given command and blocks until its completion.
 
@@ -329,15 +376,19 @@ class Shell:
         environment: t.Mapping[str, str], optional
             An optional set of environment variables that should be used during
             execution.
+        stdin: bytes, optional
+            Data that should be written to the standard input of the command,
+            which is closed once the data has been written. If unspecified,
+            the command is executed via a tty and receives no input.
 
         Returns
         -------
         CompletedProcess
             A summary of the outcome of the command execution.
         """
-        logger.debug(f"executing command: {args}")
+        logger.debug("executing command: {}", args)
         no_output = not stdout and not stderr
-        docker_container = self.container._docker
+        docker_api = self.container.daemon.api
         args_instrumented = self._instrument(args,
                                              time_limit=time_limit,
                                              kill_after=kill_after)
@@ -345,18 +396,23 @@ class Shell:
             environment = {}
         environment = {**self._environment, **environment}
         with Stopwatch() as timer:
-            retcode, output_bin = docker_container.exec_run(
+            exec_id = docker_api.exec_create(
+                self.container.id,
                 args_instrumented,
-                detach=False,
                 environment=environment,
-                tty=True,
-                stream=False,
-                socket=False,
+                tty=stdin is None,
+                stdin=stdin is not None,
                 stderr=False if no_output else stderr,  # BUG #25
                 stdout=True if no_output else stdout,  # BUG #25
-                workdir=cwd)
+                workdir=cwd)["Id"]
+            if stdin is None:
+                output_bin = docker_api.exec_start(exec_id, tty=True)
+            else:
+                output_bin = self._exec_with_stdin(exec_id, stdin)
+            retcode: int = docker_api.exec_inspect(exec_id)["ExitCode"]
+        assert isinstance(output_bin, bytes)
 
-        logger.debug(f"retcode: {retcode}")
+        logger.debug("retcode: {}", retcode)
 
         output: str | bytes | None
         if no_output:
@@ -370,9 +426,22 @@ class Shell:
                                   returncode=retcode,
                                   duration=timer.duration,
                                   output=output)
-        logger.debug(f"executed command: {result}")
+        logger.debug("executed command: {}", result)
         return result
 
+    def _exec_with_stdin(self, exec_id: str, data: bytes) -> bytes:
+        """Starts a given exec instance, feeds it some input, and returns its output."""
+        docker_api = self.container.daemon.api
+        socket = docker_api.exec_start(exec_id, socket=True)
+        raw_socket = _unwrap_socket(socket)
+        try:
+            raw_socket.sendall(data)
+            # signals the end of the input to the command
+            raw_socket.shutdown(SHUT_WR)
+            return b"".join(chunk for _, chunk in frames_iter(raw_socket, tty=False))
+        finally:
+            socket.close()
+
     def popen(
         self,
         args: str,
@@ -402,7 +471,7 @@ class Shell:
         exec_id = exec_response["Id"]
         exec_stream = docker_api.exec_start(exec_id,
                                             stream=True)
-        logger.debug(f"started Exec [{exec_id}] for Popen")
+        logger.debug("started Exec [{}] for Popen", exec_id)
         return Popen(
             args=args,
             cwd=cwd,
@@ -412,3 +481,129 @@ class Shell:
             encoding=encoding,
             stream=exec_stream,
         )
+
+
+@attr.s(eq=False, hash=False, slots=True)
+class _ShellSession:
+    """Runs commands through a single long-lived shell inside a container.
+
+    Each command is still executed by its own (forked) shell process, but is
+    sent down the stdin of a shell that is kept open for the lifetime of the
+    session, rather than paying for a fresh exec instance per command. The
+    end of each command's output is marked by a line that carries a random
+    sentinel and the exit status of the command.
+
+    Sessions should be created via :meth:`open` and must be closed once they
+    are no longer needed.
+    """
+    _shell: Shell = attr.ib()
+    _socket: object = attr.ib(repr=False)
+    _sentinel: str = attr.ib(init=False, repr=False)
+    _raw_socket: _Socket = attr.ib(init=False, repr=False)
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock, repr=False)
+    _buffer: bytearray = attr.ib(init=False, factory=bytearray, repr=False)
+    _frames: t.Iterator[tuple[int, bytes]] = attr.ib(init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._sentinel = f"__dockerblade_{uuid.uuid4().hex}__"
+        self._raw_socket = _unwrap_socket(self._socket)
+        self._frames = frames_iter(self._raw_socket, tty=False)
+
+    @classmethod
+    def open(cls, shell: Shell) -> _ShellSession:
+        """Starts a long-lived shell inside the container of a given shell."""
+        docker_api = shell.container.daemon.api
+        exec_id = docker_api.exec_create(
+            shell.container.id,
+            shell.path,
+            environment=dict(shell._environment),
+            stdin=True,
+            stdout=True,
+            stderr=False,
+            tty=False,
+            workdir="/",
+        )["Id"]
+        socket = docker_api.exec_start(exec_id, socket=True)
+        logger.debug("started Exec [{}] for shell session", exec_id)
+        return cls(shell, socket)
+
+    def close(self) -> None:
+        """Terminates the shell and closes its connection.
+
+        Waits for any command that is being executed to complete.
+        """
+        with self._lock:
+            try:
+                self._raw_socket.sendall(b"exit\n")
+            except OSError:
+                pass
+            finally:
+                self._raw_socket.close()
+
+    def run(self, args: str) -> CompletedProcess:
+        """Executes a given command and blocks until its completion.
+
+        The command is executed as by :meth:`Shell.run` from the root
+        directory, with its stdin closed and its stderr discarded, and its
+        output decoded to a string.
+
+        Raises
+        ------
+        UnexpectedError
+            If the session was terminated before the command completed.
+        """
+        logger.debug("executing command in shell session: {}", args)
+        command = " ".join(quote_container(arg)
+                           for arg in self._shell._instrument(args))
+        line = (f"{command} </dev/null 2>/dev/null; "
+                f"printf '\\n%s %d\\n' {self._sentinel} \"$?\"\n")
+        with self._lock, Stopwatch() as timer:
+            self._raw_socket.sendall(line.encode())
+            output_bin, retcode = self._read_response()
+
+        result = CompletedProcess(args=args,
+                                  returncode=retcode,
+                                  duration=timer.duration,
+                                  output=output_bin.decode().rstrip("\r\n"))
+        logger.debug("executed command: {}", result)
+        return result
+
+    def check_output(self, args: str) -> str:
+        """Executes a given command, blocks until completion, and checks return code is zero.
+
+        Raises
+        ------
+        CalledProcessError
+            If the command produced a non-zero return code.
+        UnexpectedError
+            If the session was terminated before the command completed.
+        """
+        result = self.run(args)
+        result.check_returncode()
+        assert isinstance(result.output, str)
+        return result.output
+
+    def _read_response(self) -> tuple[bytes, int]:
+        """Reads the output and exit status of the last command."""
+        marker = f"\n{self._sentinel} ".encode()
+        buffer = self._buffer
+        searched = 0
+        while True:
+            start = buffer.find(marker, searched)
+            if start >= 0:
+                end = buffer.find(b"\n", start + len(marker))
+                if end >= 0:
+                    break
+            else:
+                searched = max(0, len(buffer) - len(marker))
+
+            frame = next(self._frames, None)
+            if frame is None:
+                error_message = "shell session terminated unexpectedly"
+                raise UnexpectedError(error_message)
+            buffer += frame[1]
+
+        output = bytes(buffer[:start])
+        retcode = int(buffer[start + len(marker):end])
+        del buffer[:end + 1]
+        return output, retcode
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import pytest
 
+import os
 from contextlib import ExitStack
 import tempfile
 
@@ -61,3 +62,36 @@ def test_readonly_volume(daemon):
         # expected = 'Goodbye!'
         # files.write(mount_to, expected)
         # assert open(mount_from, 'r').read() == expected
+
+
+def test_provision_many(daemon):
+    with ExitStack() as exit_stack:
+        specs = [{'image': 'alpine:3.10', 'name': f'foobar{i}'} for i in range(3)]
+        containers = daemon.provision_many(specs)
+        exit_stack.callback(daemon.remove_many, containers)
+        assert [c.name for c in containers] == ['foobar0', 'foobar1', 'foobar2']
+        assert len({c.id for c in containers}) == 3
+
+
+def test_attach_many(daemon):
+    with ExitStack() as exit_stack:
+        provisioned = daemon.provision_many([{'image': 'alpine:3.10'}] * 2)
+        exit_stack.callback(daemon.remove_many, provisioned)
+        ids = [c.id for c in reversed(provisioned)]
+        attached = daemon.attach_many(ids)
+        assert [c.id for c in attached] == ids
+        assert [c.pid for c in attached] == [c.pid for c in reversed(provisioned)]
+        preloaded = daemon.attach_many(ids, preload=True)
+        assert [c.pid for c in preloaded] == [c.pid for c in attached]
+
+
+def test_shared():
+    url: str | None = os.environ.get("DOCKER_HOST", None)
+    try:
+        with dockerblade.DockerDaemon.shared(url) as first:
+            with dockerblade.DockerDaemon.shared(url) as second:
+                assert first is second
+            assert first.api.ping()
+        assert dockerblade.DockerDaemon.shared(url) is not first
+    finally:
+        dockerblade.DockerDaemon.close_all()
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 import pytest
 
+import io
 import os
+import stat
 import tempfile
 
 from dockerblade import exceptions as exc
@@ -71,6 +73,18 @@ def test_remove(alpine_310):
         files.remove('/bin')
     assert files.isdir('/bin')
 
+    # remove dangling symbolic link
+    shell = alpine_310.shell()
+    shell.check_call('ln -s /tmp/nowhere /tmp/dangling')
+    files.remove('/tmp/dangling')
+    assert not files.islink('/tmp/dangling')
+
+    # remove symbolic link to a directory
+    shell.check_call('ln -s /bin /tmp/bin-link')
+    files.remove('/tmp/bin-link')
+    assert not files.islink('/tmp/bin-link')
+    assert files.isdir('/bin')
+
 
 def test_mkdir(alpine_310):
     files = alpine_310.filesystem()
@@ -184,6 +198,15 @@ def test_listdir(alpine_310):
     expected = [os.path.join('/etc', p) for p in expected]
     assert files.listdir('/etc', absolute=True) == expected
 
+    # empty directory
+    files.mkdir('/tmp/emptydir')
+    assert files.listdir('/tmp/emptydir') == []
+    assert files.listdir('/tmp/emptydir', absolute=True) == []
+
+    # names containing newlines
+    files.write('/tmp/emptydir/foo\nbar', 'hello')
+    assert files.listdir('/tmp/emptydir') == ['foo\nbar']
+
 
 def test_isdir(alpine_310):
     files = alpine_310.filesystem()
@@ -205,6 +228,71 @@ def test_isfile(alpine_310):
     assert not files.isfile('/bin')
 
 
+def test_many_predicates(alpine_310):
+    files = alpine_310.filesystem()
+    paths = ['/bin', '/bin/sh', '/bin/foobar']
+    assert files.exists_many(paths) == {
+        '/bin': True, '/bin/sh': True, '/bin/foobar': False,
+    }
+    assert files.isfile_many(paths) == {
+        '/bin': False, '/bin/sh': True, '/bin/foobar': False,
+    }
+    assert files.isdir_many(paths) == {
+        '/bin': True, '/bin/sh': False, '/bin/foobar': False,
+    }
+    assert files.exists_many([]) == {}
+
+
+def test_stat_cache(alpine_310):
+    files = alpine_310.filesystem()
+    shell = alpine_310.shell()
+    with files.stat_cache(ttl=60) as cached:
+        assert not cached.exists('/tmp/cached')
+
+        # changes made via the view invalidate the cache
+        cached.write('/tmp/cached', 'hello')
+        assert cached.isfile('/tmp/cached')
+
+        # changes made behind its back do not
+        shell.run('rm /tmp/cached')
+        assert cached.isfile('/tmp/cached')
+
+        # the cache is not shared with the filesystem itself
+        assert not files.exists('/tmp/cached')
+
+        # creating missing ancestors invalidates them too
+        assert not cached.exists('/tmp/cached-a')
+        cached.makedirs('/tmp/cached-a/b/c')
+        assert cached.isdir('/tmp/cached-a')
+
+    assert not files.exists('/tmp/cached')
+
+
+def test_persistent_shell(alpine_310):
+    files = alpine_310.filesystem()
+    with files.persistent_shell() as persistent:
+        assert persistent.isdir('/bin')
+        assert persistent.isfile('/bin/sh')
+        assert not persistent.exists('/foo/bar')
+        assert persistent.access('/bin/sh', os.X_OK)
+        assert 'sh' in persistent.listdir('/bin')
+        assert persistent.find('/etc', 'passwd') == ['/etc/passwd']
+        with pytest.raises(exc.ContainerFileNotFound):
+            persistent.listdir('/foo/bar')
+
+        # sessions are reused by nested contexts
+        with persistent.persistent_shell() as nested:
+            assert nested is persistent
+            assert nested.isdir('/etc')
+        assert persistent.isdir('/etc')
+
+        # the session is not shared with the filesystem itself
+        assert files._session is None
+        assert files.isdir('/bin')
+
+    assert files.isdir('/bin')
+
+
 def test_makedirs(alpine_310):
     files = alpine_310.filesystem()
 
@@ -291,6 +379,15 @@ def test_copy_to_host(alpine_310):
         with open(fn_host, 'r') as f:
             assert f.read() == (content + '\n')
 
+    # permissions are preserved
+    shell.run('echo shared > /tmp/shared && chmod 0666 /tmp/shared')
+    shell.run('echo group > /tmp/group && chmod 0775 /tmp/group')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, mode in [('shared', 0o666), ('group', 0o775)]:
+            fn_host = os.path.join(tmp_dir, name)
+            files.copy_to_host(f'/tmp/{name}', fn_host)
+            assert stat.S_IMODE(os.stat(fn_host).st_mode) == mode
+
     # non-existent file
     with tempfile.TemporaryDirectory() as tmp_dir:
         fn_host = os.path.join(tmp_dir, 'bar')
@@ -351,6 +448,32 @@ def test_copy_from_host(alpine_310):
         assert files.exists('/tmp/foobardir/bar')
 
 
+def test_copy_many(alpine_310):
+    files = alpine_310.filesystem()
+    names = ['a', 'b', 'c', 'd', 'e']
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in names:
+            with open(os.path.join(tmp_dir, name), 'w') as fh:
+                fh.write(name)
+
+        files.copy_many_from_host(
+            (os.path.join(tmp_dir, name), f'/tmp/many-{name}')
+            for name in names)
+        for name in names:
+            assert files.read(f'/tmp/many-{name}') == name
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with pytest.raises(ExceptionGroup) as info:
+            files.copy_many_to_host([
+                ('/tmp/many-a', os.path.join(tmp_dir, 'a')),
+                ('/foo/bar', os.path.join(tmp_dir, 'bar')),
+            ])
+        assert [type(e) for e in info.value.exceptions] == [
+            exc.ContainerFileNotFound]
+        assert os.path.isfile(os.path.join(tmp_dir, 'a'))
+
+
 def test_read(alpine_310):
     files = alpine_310.filesystem()
     shell = alpine_310.shell()
@@ -375,6 +498,42 @@ def test_read(alpine_310):
         files.read('/bin')
 
 
+def test_read_into(alpine_310):
+    files = alpine_310.filesystem()
+    files.write('/tmp/streamed', 'hello world')
+    with tempfile.TemporaryFile() as fh:
+        files.read_into('/tmp/streamed', fh)
+        fh.seek(0)
+        assert fh.read() == b'hello world'
+
+    with pytest.raises(exc.ContainerFileNotFound):
+        files.read_into('/foo/bar', io.BytesIO())
+
+    with pytest.raises(exc.IsADirectoryError):
+        files.read_into('/bin', io.BytesIO())
+
+
+def test_patch(alpine_310):
+    files = alpine_310.filesystem()
+    files.write('/tmp/patched', 'hello\nworld\n')
+    diff = (
+        '--- a/patched\n'
+        '+++ b/patched\n'
+        '@@ -1,2 +1,2 @@\n'
+        ' hello\n'
+        '-world\n'
+        '+there\n'
+    )
+    files.patch('/tmp/patched', diff)
+    assert files.read('/tmp/patched') == 'hello\nthere\n'
+
+    with pytest.raises(exc.ContainerFileNotFound):
+        files.patch('/tmp/not-patched', diff)
+
+    with pytest.raises(ValueError):
+        files.patch('tmp/patched', diff)
+
+
 def test_find(alpine_310):
     files = alpine_310.filesystem()
     assert len(files.find('/etc', '*.d')) == 14
@@ -386,3 +545,25 @@ def test_find(alpine_310):
 
     with pytest.raises(exc.IsNotADirectoryError):
         files.find('/etc/hosts', 'foo')
+
+
+def test_find_many(alpine_310):
+    files = alpine_310.filesystem()
+    found = files.find_many('/etc', ['*.d', 'passwd'])
+    assert found['*.d'] == files.find('/etc', '*.d')
+    assert found['passwd'] == ['/etc/passwd']
+    assert files.find_many('/etc', []) == {}
+
+    with pytest.raises(exc.ContainerFileNotFound):
+        files.find_many('/awesome', ['foo', 'bar'])
+
+
+def test_find_iter(alpine_310):
+    files = alpine_310.filesystem()
+    assert list(files.find_iter('/etc', '*.d')) == files.find('/etc', '*.d')
+
+    with pytest.raises(exc.ContainerFileNotFound):
+        list(files.find_iter('/awesome', 'foo'))
+
+    with pytest.raises(exc.IsNotADirectoryError):
+        list(files.find_iter('/etc/hosts', 'foo'))
@@ -16,6 +16,16 @@ def test_run(alpine_310):
     assert result.output == None
 
 
+def test_run_stdin(alpine_310):
+    shell = alpine_310.shell('/bin/sh')
+    result = shell.run('cat', stdin=b'hello\nworld\n')
+    assert result.returncode == 0
+    assert result.output == 'hello\nworld'
+
+    shell.check_call('cat > /tmp/from-stdin', stdin=b'piped')
+    assert shell.check_output('cat /tmp/from-stdin') == 'piped'
+
+
 def test_bad_sources(alpine_310):
     filename = 'this-file-does-not-exist'
     with pytest.raises(dockerblade.exceptions.ContainerFileNotFound) as err: